@@ -1,16 +1,77 @@
-from flask import Flask, render_template, request, redirect, url_for, send_from_directory, jsonify
-import random, os, subprocess, traceback
+from flask import Flask, render_template, request, redirect, url_for, send_from_directory, jsonify, abort, Response
+from flask.json.provider import DefaultJSONProvider
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.exceptions import HTTPException
+from werkzeug.security import safe_join
+from urllib.parse import quote
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import random, os, sys, subprocess, traceback, threading, hashlib, logging, functools, shutil
 
-# Import the necessary functions and global variables from your module
-from timetable_generator import assign_subjects_for_faculty, export_all, empty_table_for_shift, FREE_DAY_SETTINGS, normalize_token, ensure_div_table
+try:
+    import orjson
+except ImportError:  # optional speed-up; Flask's stdlib json provider is used otherwise
+    orjson = None
+
+
+@functools.cache
+def _generator():
+    """
+    Imports the scheduling/export module on first use. It pulls in openpyxl,
+    which the page routes never need.
+    """
+    import timetable_generator
+    return timetable_generator
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (request parsing and jsonify)."""
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+logger = logging.getLogger(__name__)
+logger.setLevel(os.environ.get("LOG_LEVEL", "WARNING"))
 app.config["RESULT_FOLDER"] = os.path.join(os.getcwd(), "results")
+# Every distinct payload keeps its own result folder; beyond this many, the
+# oldest are deleted when a new job starts.
+app.config["MAX_RESULTS"] = int(os.environ.get("MAX_RESULTS", 100))
+app.config["MAX_CONTENT_LENGTH"] = 2 * 1024 * 1024
+# Each generation job is one sequential scheduling pass (faculties share the
+# division tables), so parallelism comes from running jobs side by side.
+app.config["GENERATION_WORKERS"] = int(os.environ.get("GENERATION_WORKERS", os.cpu_count() or 1))
+# Each job writes its workbooks from a pool of its own; split the CPUs between
+# the jobs that can run at once instead of giving every job all of them.
+app.config["EXPORT_WORKERS"] = int(os.environ.get(
+    "EXPORT_WORKERS", max(1, (os.cpu_count() or 1) // app.config["GENERATION_WORKERS"])))
+# Let the front-end server send downloads (see README): SENDFILE=1 for
+# Apache/lighttpd X-Sendfile, X_ACCEL_PREFIX=/protected/ for nginx.
+app.use_x_sendfile = os.environ.get("SENDFILE") == "1"
+app.config["X_ACCEL_PREFIX"] = os.environ.get("X_ACCEL_PREFIX", "")
+# Templates only change during development: outside debug mode Jinja neither
+# stats them per request nor re-parses them after a restart (bytecode cache
+# in the per-user temp dir).
+app.config["TEMPLATES_AUTO_RELOAD"] = os.environ.get("FLASK_DEBUG") == "1"
+app.jinja_options = {**app.jinja_options, "bytecode_cache": FileSystemBytecodeCache()}
+for _name in ("index.html", "builder.html", "success.html"):
+    app.jinja_env.get_template(_name)
 
-# Memory store
-ftables = {}
-dtables = {}
+# Background generation jobs: job_id (payload hash) -> Future. A job leaves
+# the registry once /status has reported its outcome; finished jobs nobody
+# polls are dropped oldest first beyond MAX_FINISHED_JOBS.
+executor = ProcessPoolExecutor(max_workers=app.config["GENERATION_WORKERS"])
+jobs = {}
+jobs_lock = threading.Lock()
+app.config["MAX_FINISHED_JOBS"] = 256
+
+# Result folder listings: folder -> (st_mtime_ns, sorted file names)
+_dir_cache = {}
 
 @app.route("/")
 def index():
@@ -20,12 +81,108 @@ def index():
 def builder():
     return render_template("builder.html")
 
+def _run_generation(data, result_folder, export_workers=None):
+    """
+    Runs one full scheduling + export pass in a worker process.
+    All tables are local to the call, so concurrent jobs never share state.
+    """
+    tg = _generator()
+    rng = random.Random(7)
+    ftables, dtables = {}, {}
+    faculties = data.get("faculties", [])
+
+    # Collect and set universal headers
+    university = data.get("university", "")
+    department = data.get("department", "")
+    academic = data.get("academic", "")
+
+    # Read every subject's division fields once; both passes below reuse them.
+    # (sem, div) are normalised and interned here and written back, so every
+    # later lookup (holidays, division tables, scheduling) uses the same key.
+    subj_rows = []
+    for f in faculties:
+        for subj in f.get("Subjects", []):
+            sem, div = subj.get("Semester"), subj.get("Division")
+            if sem and div:
+                subj["Semester"] = sem = sys.intern(str(sem))
+                subj["Division"] = div = sys.intern(tg.normalize_token(div))
+            subj_rows.append((sem, div, subj.get("Holidays", []), subj.get("Div_Shift", "8-3")))
+
+    # Populate FREE_DAY_SETTINGS from JSON before scheduling
+    tg.FREE_DAY_SETTINGS.clear()
+    tg.FREE_DAY_SETTINGS.update(
+        ((sem, div), holidays)
+        for sem, div, holidays, _ in subj_rows if sem and div and holidays
+    )
+
+    # Initialize and apply holidays to all timetables
+    for f in faculties:
+        fname = f["Name"]
+        if fname not in ftables:
+            ftables[fname] = tg.empty_table_for_shift(f["Shift"])
+
+    # many subjects share a division; create each (sem, div) table only once
+    seen = set()
+    for sem, div, _, dshift in subj_rows:
+        if (sem, div) in seen:
+            continue
+        seen.add((sem, div))
+        tg.ensure_div_table(dtables, sem, div, dshift)
+    
+    tg.apply_free_day_markings_from_inputs(dtables, faculties)
+
+    # Assign subjects
+    tg.assign_subjects(faculties, ftables, dtables, rng=rng)
+    
+    # Export results into a hidden scratch folder and move it into place once
+    # every workbook is written: a job killed midway never leaves a result
+    # folder behind that /generate would serve as finished.
+    parent, name = os.path.split(os.path.normpath(result_folder))
+    partial = os.path.join(parent, f".{name}.partial")
+    shutil.rmtree(partial, ignore_errors=True)
+    os.makedirs(partial)
+    tg.export_all(ftables, dtables, faculties,
+               university=university,
+               department=department,
+               academic=academic,
+               out_dir=partial,
+               max_workers=export_workers)
+    shutil.rmtree(result_folder, ignore_errors=True)
+    os.replace(partial, result_folder)
+
+def _prune_results():
+    """Deletes the oldest result folders beyond MAX_RESULTS (jobs_lock held)."""
+    try:
+        with os.scandir(app.config["RESULT_FOLDER"]) as it:
+            done = [e for e in it if e.is_dir() and not e.name.startswith(".")]
+    except FileNotFoundError:
+        return
+    done.sort(key=lambda e: e.stat().st_mtime_ns)
+    for e in done[:max(0, len(done) - app.config["MAX_RESULTS"])]:
+        shutil.rmtree(e.path, ignore_errors=True)
+
+def _submit_job(data, out_dir):
+    """Queues a generation job (jobs_lock held), replacing the pool if it broke."""
+    global executor
+    try:
+        return executor.submit(_run_generation, data, out_dir, app.config["EXPORT_WORKERS"])
+    except BrokenProcessPool:
+        # a worker died (OOM, crash in a C extension); the pool takes no more
+        # work, and its queued jobs have already failed, so start a fresh one
+        logger.error("Generation pool is broken; starting a new one")
+        executor.shutdown(wait=False)
+        executor = ProcessPoolExecutor(max_workers=app.config["GENERATION_WORKERS"])
+        return executor.submit(_run_generation, data, out_dir, app.config["EXPORT_WORKERS"])
+
+def _prune_jobs():
+    """Drops the oldest finished jobs beyond MAX_FINISHED_JOBS (jobs_lock held)."""
+    finished = [job_id for job_id, future in jobs.items() if future.done()]
+    for job_id in finished[:max(0, len(finished) - app.config["MAX_FINISHED_JOBS"])]:
+        del jobs[job_id]
+
 @app.route("/generate", methods=["POST"])
 def generate():
-    print(">>> /generate called (POST)")
-    global ftables, dtables
-    ftables, dtables = {}, {}
-    random.seed(7)
+    logger.debug("/generate called")
 
     try:
         data = request.get_json(force=True)
@@ -33,79 +190,114 @@ def generate():
         if not faculties:
             return jsonify(ok=False, error="No faculties provided"), 400
 
-        # Collect and set universal headers
-        university = data.get("university", "")
-        department = data.get("department", "")
-        academic = data.get("academic", "")
-
-        # Populate FREE_DAY_SETTINGS from JSON before scheduling
-        FREE_DAY_SETTINGS.clear()
-        for f in faculties:
-            for subj in f.get("Subjects", []):
-                sem = subj.get("Semester")
-                div = subj.get("Division")
-                holidays = subj.get("Holidays", [])
-                
-                if sem and div and holidays:
-                    key = (str(sem), normalize_token(div))
-                    FREE_DAY_SETTINGS[key] = holidays
-
-        # Initialize and apply holidays to all timetables
-        for f in faculties:
-            fname = f["Name"]
-            fshift = f["Shift"]
-            if fname not in ftables:
-                ftables[fname] = empty_table_for_shift(fshift)
-
-            for subj in f.get("Subjects", []):
-                sem = subj.get("Semester")
-                div = subj.get("Division")
-                dshift = subj.get("Div_Shift", "8-3")
-                dtbl, _ = ensure_div_table(dtables, sem, div, dshift)
-        
-        from timetable_generator import apply_free_day_markings_from_inputs
-        apply_free_day_markings_from_inputs(dtables, faculties)
-
-        # Assign subjects
-        for f in faculties:
-            assign_subjects_for_faculty(f, ftables, dtables)
-        
-        # Export results
-        os.makedirs(app.config["RESULT_FOLDER"], exist_ok=True)
-        prev_cwd = os.getcwd()
-        try:
-            os.chdir(app.config["RESULT_FOLDER"])
-            export_all(ftables, dtables, faculties,
-                       university=university,
-                       department=department,
-                       academic=academic)
-        finally:
-            os.chdir(prev_cwd)
-
-        return jsonify(ok=True, message="Generated", redirect=url_for("success"))
+        # reject input that cannot fit in a week before it occupies a worker
+        problems = _generator().find_overbooked(faculties)
+        if problems:
+            return jsonify(ok=False, error="Over-constrained input: " + "; ".join(problems)), 422
+
+        # identical payloads give identical timetables, so jobs and their
+        # output folder are keyed by the payload's content hash
+        job_id = hashlib.sha256(app.json.dumps(data, sort_keys=True).encode()).hexdigest()[:16]
+        out_dir = os.path.join(app.config["RESULT_FOLDER"], job_id)
+
+        with jobs_lock:
+            future = jobs.get(job_id)
+            if future is None and os.path.isdir(out_dir):
+                return jsonify(ok=True, message="Generated", cached=True,
+                               redirect=url_for("success", key=job_id))
+            if future is None or (future.done() and future.exception() is not None):
+                jobs.pop(job_id, None)  # re-inserted last, as the newest job
+                _prune_results()
+                jobs[job_id] = _submit_job(data, out_dir)
+                _prune_jobs()
+
+        return jsonify(ok=True, message="Queued", job_id=job_id,
+                       status_url=url_for("status", job_id=job_id)), 202
+
+    except HTTPException as e:
+        # malformed or oversized body
+        return jsonify(ok=False, error=e.description), e.code
 
     except Exception as e:
         tb = traceback.format_exc()
-        print("ERROR in /generate:", e)
-        print(tb)
+        logger.error("ERROR in /generate: %s\n%s", e, tb)
         return jsonify(ok=False, error=str(e), traceback=tb.splitlines()[-12:]), 500
 
+@app.route("/status/<job_id>")
+def status(job_id):
+    with jobs_lock:
+        future = jobs.get(job_id)
+    if future is None:
+        # already reported (e.g. to another client posting the same payload)
+        folder = safe_join(app.config["RESULT_FOLDER"], job_id)
+        if folder is not None and os.path.isdir(folder):
+            return jsonify(ok=True, state="done", message="Generated", redirect=url_for("success", key=job_id))
+        return jsonify(ok=False, error="Unknown job"), 404
+
+    if not future.done():
+        state = "running" if future.running() else "queued"
+        return jsonify(ok=True, state=state)
+
+    # the outcome is reported below; a later POST of the payload starts afresh
+    with jobs_lock:
+        if jobs.get(job_id) is future:
+            del jobs[job_id]
+
+    exc = future.exception()
+    if exc is not None:
+        # the worker's traceback travels along as the exception's __cause__
+        remote = exc.__cause__
+        tb = str(remote).strip('"\n') if remote is not None else "".join(traceback.format_exception(exc))
+        logger.error("ERROR in generation job: %s\n%s", exc, tb)
+        return jsonify(ok=False, state="error", error=str(exc), traceback=tb.splitlines()[-12:])
+
+    return jsonify(ok=True, state="done", message="Generated", redirect=url_for("success", key=job_id))
+
+
+def _list_results(folder):
+    """
+    Sorted names of the files in `folder`, rescanned only when its mtime
+    changes. Hidden entries are left out.
+    """
+    try:
+        mtime = os.stat(folder).st_mtime_ns
+    except FileNotFoundError:
+        return []
+    cached = _dir_cache.get(folder)
+    if cached is None or cached[0] != mtime:
+        with os.scandir(folder) as it:
+            cached = (mtime, sorted(e.name for e in it if e.is_file() and not e.name.startswith(".")))
+        _dir_cache[folder] = cached
+    return cached[1]
 
 @app.route("/success")
 def success():
-    files = []
-    if os.path.exists(app.config["RESULT_FOLDER"]):
-        files = sorted(os.listdir(app.config["RESULT_FOLDER"]))
-    return render_template("success.html", files=files)
+    key = request.args.get("key", "")
+    if not key:
+        # results live in one folder per job; without a job there is nothing to list
+        return redirect(url_for("builder"))
+    folder = safe_join(app.config["RESULT_FOLDER"], key)
+    if folder is None:
+        abort(404)
+    files = _list_results(folder)
+    return render_template("success.html", files=files, key=key)
 
 @app.route("/download/<path:filename>")
 def download_file(filename):
-    return send_from_directory(app.config["RESULT_FOLDER"], filename, as_attachment=True)
+    prefix = app.config["X_ACCEL_PREFIX"]
+    if not prefix:
+        return send_from_directory(app.config["RESULT_FOLDER"], filename, as_attachment=True)
+    path = safe_join(app.config["RESULT_FOLDER"], filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    # nginx serves the file from its internal location; we only send headers
+    name = quote(os.path.basename(filename))
+    return Response(headers={
+        "X-Accel-Redirect": prefix.rstrip("/") + "/" + quote(filename),
+        "Content-Disposition": f"attachment; filename*=UTF-8''{name}",
+        "Content-Type": "application/octet-stream",
+    })
 
 if __name__ == "__main__":
-  
-
-    try:
-        app.run(host="0.0.0.0", port=5000, debug=True, threaded=True)
-    finally:
-            pass
\ No newline at end of file
+    # Werkzeug development server; production runs under gunicorn (see README).
+    app.run(host="0.0.0.0", port=5000, debug=os.environ.get("FLASK_DEBUG") == "1", threaded=True)
@@ -233,6 +233,21 @@ function render() {
 
 // ... (all other functions are the same)
 
+// Generation runs as a background job; poll its status until it finishes.
+async function waitForJob(statusUrl) {
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, 500));
+        const res = await fetch(statusUrl);
+        const job = await res.json();
+        if (!job.ok) {
+            throw new Error(job.error || "Generation failed.");
+        }
+        if (job.state === "done") {
+            return job;
+        }
+    }
+}
+
 async function submitAll() {
     const errorBox = document.getElementById('errorBox');
     const btn = document.getElementById('submitBtn');
@@ -278,7 +293,9 @@ async function submitAll() {
         if (!data.ok) {
             throw new Error(data.error || "Generation failed.");
         }
-        window.location = data.redirect;
+        // already-generated payloads come back with a redirect and no job to poll
+        const result = data.status_url ? await waitForJob(data.status_url) : data;
+        window.location = result.redirect;
     } catch (err) {
         errorBox.textContent = err.message || String(err);
         errorBox.classList.remove('d-none');
@@ -14,28 +14,65 @@ Added feature:
 Other behaviors, locking logic and exports are left unchanged.
 """
 from __future__ import annotations
+import argparse
+import functools
+import json
 import logging
+import multiprocessing
+import multiprocessing.util
+import os
 import random
 import re
 import sys
-import pandas as pd
-from collections import OrderedDict
-from datetime import datetime
-from openpyxl import load_workbook
+from collections import Counter
+from copy import copy
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from logging.handlers import MemoryHandler
+from zipfile import ZipFile, ZIP_DEFLATED
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.writer.excel import ExcelWriter
 from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange
 from openpyxl.styles import Alignment, PatternFill, Font, Border, Side
 
+try:
+    import xlsxwriter
+except ImportError:  # optional speed-up; openpyxl's write-only mode is used otherwise
+    xlsxwriter = None
+
 # ---------- Logging ----------
 LOG_FILE = "logs.txt"
 logger = logging.getLogger("timetable_full_locking_fixed")
 logger.setLevel(logging.DEBUG)
 
-# File handler
-fh = logging.FileHandler(LOG_FILE, mode="w", encoding="utf-8")
+# File handler. Each run starts a fresh log; worker processes (generation
+# jobs, export pools) append to it, and so does the parent, so the writes of
+# separate processes land one after another instead of over each other.
+if multiprocessing.parent_process() is None:
+    open(LOG_FILE, "w").close()
+fh = logging.FileHandler(LOG_FILE, mode="a", encoding="utf-8")
 fh.setLevel(logging.DEBUG)
 fh_formatter = logging.Formatter('%(asctime)s | %(levelname)-7s | %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
 fh.setFormatter(fh_formatter)
-logger.addHandler(fh)
+
+# File records are buffered and written in batches: at the end of each
+# export_all, when 1024 are pending, or at once for errors. The buffer is
+# emptied before a fork so children never re-write the parent's records, and
+# worker processes, which leave through os._exit, flush theirs on the way out.
+log_buffer = MemoryHandler(1024, flushLevel=logging.ERROR, target=fh)
+log_buffer.setLevel(logging.DEBUG)
+logger.addHandler(log_buffer)
+
+def _flush_log_at_worker_exit(handler):
+    multiprocessing.util.Finalize(handler, handler.flush, exitpriority=0)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=log_buffer.flush)
+multiprocessing.util.register_after_fork(log_buffer, _flush_log_at_worker_exit)
+if multiprocessing.parent_process() is not None:
+    _flush_log_at_worker_exit(log_buffer)
 
 # Console handler (info)
 ch = logging.StreamHandler(sys.stdout)
@@ -65,6 +102,12 @@ SHIFT_SLOTS = {
         "3-4","4-5"
     ]
 }
+# Break and lunch labels all end in one of these; every other slot is taught.
+BREAK_SUFFIXES = ("Short Break", "Lunch Break")
+# shift -> slot label -> True for teaching slots, classified once
+IS_TEACHING = {sh: {s: not s.endswith(BREAK_SUFFIXES) for s in slots} for sh, slots in SHIFT_SLOTS.items()}
+# shift -> its teaching slots (no breaks / lunch), in order
+TEACHING_SLOTS = {sh: tuple(s for s, t in kinds.items() if t) for sh, kinds in IS_TEACHING.items()}
 
 DESIGNATION_MENU = {"1":"Professor","2":"Assistant Professor","3":"Jr Assistant Professor"}
 SHIFT_MENU       = {"1":"8-3","2":"10-5"}
@@ -124,89 +167,141 @@ for sh, slots in SHIFT_SLOTS.items():
     CANONICAL_MAP[sh] = cmap
     REVERSE_CANONICAL_MAP[sh] = rmap
 
-def slots_equivalent(shift_a, label_a, shift_b, label_b) -> bool:
-    ca = CANONICAL_MAP[shift_a].get(label_a)
-    cb = CANONICAL_MAP[shift_b].get(label_b)
-    return (ca is not None) and (cb is not None) and (ca[0] == cb[0] and ca[1] == cb[1])
-
-def pair_slots_equivalent(shift_a, a1, a2, shift_b, b1, b2) -> bool:
-    return slots_equivalent(shift_a, a1, shift_b, b1) and slots_equivalent(shift_a, a2, shift_b, b2)
+# ---------- Slot occupancy bitmasks ----------
+# Every distinct teaching time across all shifts gets one bit, in time order, so a
+# faculty's and a division's masks line up even when their shifts differ.
+TIME_BITS = {
+    canon: 1 << i
+    for i, canon in enumerate(sorted({
+        CANONICAL_MAP[sh][s] for sh, slots in TEACHING_SLOTS.items() for s in slots
+        if CANONICAL_MAP[sh][s] is not None
+    }))
+}
+# shift -> slot label -> its bit (0 for breaks/lunch, which are never free)
+SLOT_MASK = {
+    sh: {s: (TIME_BITS.get(CANONICAL_MAP[sh][s], 0) if t else 0) for s, t in kinds.items()}
+    for sh, kinds in IS_TEACHING.items()
+}
+SHIFT_MASK = {sh: sum(m.values()) for sh, m in SLOT_MASK.items()}
+# shift -> bit -> slot label (inverse of SLOT_MASK, teaching slots only)
+BIT_SLOT = {sh: {b: s for s, b in m.items() if b} for sh, m in SLOT_MASK.items()}
+# mask -> number of free slots in it (masks are at most len(TIME_BITS) bits wide)
+POPCOUNT = [bin(m).count("1") for m in range(1 << len(TIME_BITS))]
 
 # ---------- Timetable table helpers ----------
+class SlotTable(dict):
+    """
+    A {day: {slot_label: cell_text}} timetable that also keeps, per day, a
+    bitmask of its still-free teaching slots and (division tables) the
+    subjects written that day, plus the week's free-slot count. Write cells
+    through occupy().
+    """
+    def __init__(self, shift, rows=()):
+        super().__init__(rows)
+        self.shift = shift
+        self.free = dict.fromkeys(DAYS, SHIFT_MASK[shift])
+        self.free_count = len(DAYS) * POPCOUNT[SHIFT_MASK[shift]]
+        self.workdays = tuple(DAYS)  # days not marked as free days (see mark_free_day)
+        self.subjects = {d: set() for d in DAYS}
+
+# One prototype row per shift (breaks pre-filled); tables are built by copying it.
+_EMPTY_ROWS = {
+    sh: {s: ("" if t else s) for s, t in kinds.items()}
+    for sh, kinds in IS_TEACHING.items()
+}
+
 def empty_table_for_shift(shift):
-    table = {d: {} for d in DAYS}
-    for d in DAYS:
-        for s in SHIFT_SLOTS[shift]:
-            table[d][s] = s if ("Break" in s or "Lunch" in s) else ""
-    return table
-
-def consecutive_pairs_for_shift(shift):
-    slots = [s for s in SHIFT_SLOTS[shift]]
+    row = _EMPTY_ROWS[shift]
+    return SlotTable(shift, ((d, dict(row)) for d in DAYS))
+
+# one blank table per shift, only ever read (export of a faculty with no table)
+_EMPTY_TABLES = {sh: empty_table_for_shift(sh) for sh in SHIFT_SLOTS}
+
+@functools.lru_cache(maxsize=4096)
+def _subject_key(subject):
+    return (subject or "").strip().lower()
+
+# Cell texts repeat for every session of a subject; build each one once and
+# hand out the same string object afterwards.
+@functools.lru_cache(maxsize=4096)
+def faculty_cell(subject, sem, div, batch=None):
+    """Faculty-table text: "<subject> (Sem<sem> Div<div>)", or the lab form when `batch` is given."""
+    if batch is None:
+        return f"{subject} (Sem{sem} Div{div})"
+    return f"{subject} Lab (Sem{sem} Div{div}) [{batch}]"
+
+@functools.lru_cache(maxsize=4096)
+def division_cell(subject, fname, batch=None):
+    """Division-table text: "<subject> (<faculty>)", or the lab form when `batch` is given."""
+    if batch is None:
+        return f"{subject} ({fname})"
+    return f"{subject} Lab ({fname}) [{batch}]"
+
+@functools.lru_cache(maxsize=4096)
+def free_day_cell(sem, div):
+    return f"{FREE_DAY_LABEL} (Sem{sem} Div{div})"
+
+def mark_free_day(tbl, day, sem, div):
+    """Stamps every teaching slot of `day` with the free-day label and drops it from tbl.workdays."""
+    # same effect as occupy() on each teaching slot, done for the whole day at once
+    tbl[day].update(dict.fromkeys(TEACHING_SLOTS[tbl.shift], free_day_cell(sem, div)))
+    tbl.free_count -= POPCOUNT[tbl.free[day]]
+    tbl.free[day] = 0
+    tbl.workdays = tuple(d for d in tbl.workdays if d != day)
+
+def occupy(tbl, day, slot, text, subject=None):
+    """Write a cell; `subject` (given for division tables) indexes the day for open_days."""
+    tbl[day][slot] = text
+    bit = tbl.free[day] & SLOT_MASK[tbl.shift].get(slot, 0)
+    if bit:
+        tbl.free[day] ^= bit
+        tbl.free_count -= 1
+    if subject:
+        tbl.subjects[day].add(_subject_key(subject))
+
+def _consecutive_pairs(shift):
+    slots = SHIFT_SLOTS[shift]
+    teaching = IS_TEACHING[shift]
     pairs = []
     for i in range(len(slots)-1):
         a, b = slots[i], slots[i+1]
-        if ("Break" in a or "Lunch" in a or "Break" in b or "Lunch" in b):
+        if not (teaching[a] and teaching[b]):
             continue
         if CANONICAL_MAP[shift].get(a) is None or CANONICAL_MAP[shift].get(b) is None:
             continue
         pairs.append((a,b))
     return pairs
 
-def free_slot(tbl, day, slot):
-    # True only when the cell is an empty string (available).
-    val = tbl[day].get(slot, "")
-    if not isinstance(val, str):
-        return False
-    v = val.strip()
-    if v == "":
-        return True
-    up = v.upper()
-    # detect holiday / competitive / sports markers
-    if FREE_DAY_LABEL.upper() in up or "COMPETITIVE" in up or "SUNCLUBS" in up or "SPORT" in up or "HOLIDAY" in up:
-        return False
-    # block breaks, lunches, merges
-    if "BREAK" in up or "LUNCH" in up or v == "MERGE":
-        return False
-    # any other non-empty text means occupied
-    return False
+# shift -> consecutive teaching slot pairs (lab slots), computed once
+CONSECUTIVE_PAIRS = {sh: tuple(_consecutive_pairs(sh)) for sh in SHIFT_SLOTS}
 
+# shift -> [(pair_mask, (s1, s2))] for its lab pairs, in slot order
+SHIFT_PAIRS = {
+    sh: [(SLOT_MASK[sh][a] | SLOT_MASK[sh][b], (a, b)) for a, b in CONSECUTIVE_PAIRS[sh]]
+    for sh in SHIFT_SLOTS
+}
 
-def free_pair(tbl, day, s1, s2):
-    return free_slot(tbl, day, s1) and free_slot(tbl, day, s2)
+_RE_BATCH_SUFFIX = re.compile(r'\[[^\]]+\]$')
+# "<subject> Lab ..." / "<subject> (...", else the looser "<subject>(..." / "<subject> - ..."
+_RE_CELL_SUBJECT = re.compile(r'^\s*([^\(]+?)\s+(?:Lab|\()|^\s*([^\(]+?)\s*(?:\(|-)')
 
 def extract_subject_from_cell(text):
+    # blank and non-text cells are the most common; answer them without the cache
     if not isinstance(text, str) or not text.strip():
         return None
+    return _extract_subject(text)
+
+# An export scans every workbook's cells in turn; the cache holds all distinct
+# cell texts of a large run so those repeated scans never evict each other.
+@functools.lru_cache(maxsize=16384)
+def _extract_subject(text):
     t = text.strip()
-    t = re.sub(r'\[[^\]]+\]$', '', t).strip()
-    m = re.match(r'^\s*([^\(]+?)\s+(?:Lab|\()', t)
+    t = _RE_BATCH_SUFFIX.sub('', t).strip()
+    m = _RE_CELL_SUBJECT.match(t)
     if m:
-        return m.group(1).strip()
-    m2 = re.match(r'^\s*([^\(]+?)\s*(?:\(|-)', t)
-    if m2:
-        return m2.group(1).strip()
+        return (m.group(1) or m.group(2)).strip()
     return t.split()[0] if t.split() else t
 
-def day_has_subject(tbl, day, subject):
-    target = (subject or "").strip().lower()
-    if not target:
-        return False
-    for v in tbl[day].values():
-        if not isinstance(v, str): continue
-        if target in v.lower():
-            return True
-    return False
-
-def day_has_division(tbl, day, sem, div):
-    needle_sem = f"sem{sem}".lower()
-    needle_div = f"div{div}".lower()
-    for v in tbl[day].values():
-        if not isinstance(v, str): continue
-        low = v.lower().replace(" ", "")
-        if needle_sem in low and needle_div in low:
-            return True
-    return False
-
 # ---------- shift compatibility rules ----------
 def is_slot_allowed_for_10_5_on_8_3(slot_label: str) -> bool:
     canon = None
@@ -224,11 +319,33 @@ def division_slot_allowed_for_faculty(fac_shift: str, div_shift: str, slot_label
         return is_slot_allowed_for_10_5_on_8_3(slot_label)
     return True
 
+def allowed_slot_mask(fac_shift: str, div_shift: str) -> int:
+    """Bits of the division's teaching slots this faculty shift may take."""
+    return sum(b for s, b in SLOT_MASK[div_shift].items()
+               if b and division_slot_allowed_for_faculty(fac_shift, div_shift, s))
+
 def division_pair_allowed_for_faculty(fac_shift: str, div_shift: str, pair: tuple) -> bool:
     if fac_shift == "10-5" and div_shift == "8-3":
         return is_slot_allowed_for_10_5_on_8_3(pair[0]) and is_slot_allowed_for_10_5_on_8_3(pair[1])
     return True
 
+def allowed_pair_map(fac_shift: str, div_shift: str) -> dict:
+    """pair_mask -> division lab pair, for the pairs this faculty shift may take."""
+    return {m: pair for m, pair in SHIFT_PAIRS[div_shift]
+            if division_pair_allowed_for_faculty(fac_shift, div_shift, pair)}
+
+# Shift compatibility, evaluated once per (fac_shift, div_shift):
+#   ALLOWED_SLOTS -> division slot bits the faculty may take (and also has)
+#   LAB_PAIRS     -> [(pair_mask, faculty_pair, division_pair)] present in both
+#                    shifts and allowed, in slot order; every lab loop walks
+#                    this flat list instead of pairing the two shifts' slots
+ALLOWED_SLOTS = {(fs, ds): allowed_slot_mask(fs, ds) & SHIFT_MASK[fs] for fs in SHIFT_SLOTS for ds in SHIFT_SLOTS}
+LAB_PAIRS = {
+    (fs, ds): [(m, fpair, allowed[m]) for m, fpair in SHIFT_PAIRS[fs] if m in allowed]
+    for fs in SHIFT_SLOTS for ds in SHIFT_SLOTS
+    for allowed in (allowed_pair_map(fs, ds),)
+}
+
 # ---------- Input helpers (unchanged semantics) ----------
 def input_menu(prompt, menu):
     while True:
@@ -254,8 +371,12 @@ def input_int(prompt, min_val=None, max_val=None):
         except Exception:
             print("Enter valid integer.")
 
+_RE_WHITESPACE = re.compile(r'\s+')
+_RE_LIST_SEP = re.compile(r'[ ,]+')
+
+@functools.lru_cache(maxsize=1024)
 def normalize_token(s: str) -> str:
-    return re.sub(r'\s+','', (s or "").strip()).upper()
+    return _RE_WHITESPACE.sub('', (s or "").strip()).upper()
 
 def parse_batches_input(raw: str):
     raw = (raw or "").strip()
@@ -263,7 +384,7 @@ def parse_batches_input(raw: str):
         return ["B1"], False
     if "/" in raw and "," not in raw:
         return [raw.replace(" ", "")], True
-    parts = [normalize_token(x) for x in re.split(r'[ ,]+', raw) if x.strip()]
+    parts = [normalize_token(x) for x in _RE_LIST_SEP.split(raw) if x.strip()]
     if not parts: parts = ["B1"]
     return parts, False
 
@@ -283,11 +404,16 @@ DAYS_MAP = {
 # Stores mapping (sem,div) -> list_of_days_selected
 FREE_DAY_SETTINGS: dict[tuple[str,str], list[str]] = {}
 
-def ask_and_record_free_days_for_division(sem: str, div: str):
+def ask_and_record_free_days_for_division(sem: str, div: str, holidays_list: list[str] | None = None):
     """
-    Prompt user to mark free/holiday days for Sem/Div.
+    Prompt user to mark free/holiday days for Sem/Div, unless the days are
+    already given as `holidays_list` (config-file mode).
     Updates FREE_DAY_SETTINGS[(sem,div)] = [days...]
     """
+    if holidays_list is not None:
+        FREE_DAY_SETTINGS[(str(sem), normalize_token(div))] = holidays_list
+        logger.info("Recorded holidays for Sem%s Div%s => %s", sem, div, holidays_list)
+        return
 
     # ask how many holidays for this division (directly)
     while True:
@@ -348,7 +474,7 @@ def get_faculty_data():
             sub_type = input_menu("Select Type:", TEACHING_TYPE_MENU)
             if sub_type in ("Lab", "Both"):
                 divs_raw = input("Lab Divisions (comma-separated, e.g., A,B): ")
-                divs = [normalize_token(x) for x in re.split(r'[ ,]+', divs_raw) if x.strip()]
+                divs = [normalize_token(x) for x in _RE_LIST_SEP.split(divs_raw) if x.strip()]
                 for div in divs:
                     div_shift = input_menu(f"Choose Shift for Division {div}:", SHIFT_MENU)
                     # Ask free-day setting for this sem/div (NEW)
@@ -375,7 +501,7 @@ def get_faculty_data():
 
             if sub_type in ("Theory", "Both"):
                 divs_raw = input("Theory Divisions (comma-separated, e.g., A,B): ")
-                divs = [normalize_token(x) for x in re.split(r'[ ,]+', divs_raw) if x.strip()]
+                divs = [normalize_token(x) for x in _RE_LIST_SEP.split(divs_raw) if x.strip()]
                 for div in divs:
                     div_shift = input_menu(f"Choose Shift for Division {div}:", SHIFT_MENU)
                     # Ask free-day setting for this sem/div (NEW)
@@ -406,6 +532,70 @@ def get_faculty_data():
         })
     return faculty_list
 
+def load_faculty_data_from_json(path):
+    """
+    Non-interactive counterpart of the header prompts and get_faculty_data():
+    reads the JSON the web builder posts ({"university", "department",
+    "academic", "faculties": [...]}, holidays given per subject as
+    "Holidays") and records names, course codes and free days the same way.
+    Returns (headers, faculty_list).
+    """
+    with open(path, encoding="utf-8") as fp:
+        data = json.load(fp)
+
+    faculty_list = []
+    for f in data.get("faculties", []):
+        name = str(f["Name"]).strip()
+        FACULTY_FULLNAME[name] = str(f.get("Full_Name") or name).strip()
+        subjects = []
+        for s in f.get("Subjects", []):
+            sem, div = str(s["Semester"]), normalize_token(s["Division"])
+            # the builder sends "Holidays": [] for every subject without any, so
+            # only a non-empty list is recorded, as /generate does; an empty one
+            # must not wipe days another subject gave for the same division
+            holidays = s.get("Holidays")
+            if holidays:
+                ask_and_record_free_days_for_division(sem, div, list(holidays))
+            elif (sem, div) not in FREE_DAY_SETTINGS:
+                ask_and_record_free_days_for_division(sem, div, [])
+            entry = {
+                "Type": s["Type"],
+                "Semester": sem,
+                "Division": div,
+                "Div_Shift": s.get("Div_Shift", "8-3"),
+                "Subject": str(s["Subject"]).strip(),
+                "Course_Code": str(s.get("Course_Code", "")).strip(),
+                "Placed": 0
+            }
+            if s["Type"] == "Lab":
+                batches = s.get("Batches", "")
+                if isinstance(batches, str):
+                    batches, grouped = parse_batches_input(batches)
+                else:
+                    grouped = bool(s.get("Batches_Grouped", False))
+                entry.update(Num_Labs=int(s.get("Num_Labs", 1)), Batches=list(batches) or ["B1"],
+                             Batches_Grouped=grouped)
+            else:
+                entry["Theory_Classes"] = int(s.get("Theory_Classes", 1))
+            subjects.append(entry)
+            FACULTY_SUBJECT_COURSE[(name, sem, div, entry["Subject"], entry["Type"])] = entry["Course_Code"]
+
+        faculty_list.append({
+            "Name": name,
+            "Full_Name": FACULTY_FULLNAME[name],
+            "Designation": f.get("Designation", ""),
+            "Shift": f.get("Shift", "8-3"),
+            "Weekly_Hours": int(f.get("Weekly_Hours", 0)),
+            "Subjects": subjects
+        })
+
+    headers = {
+        "university": data.get("university", ""),
+        "department": data.get("department", ""),
+        "academic": data.get("academic") or "TIME TABLE – ODD SEMESTER 2025-26",
+    }
+    return headers, faculty_list
+
 # ---------- Low-level placement (accurate canonical matching) ----------
 def ensure_div_table(dtables, sem, div, div_shift):
     key = (sem, div)
@@ -414,310 +604,357 @@ def ensure_div_table(dtables, sem, div, div_shift):
 
         # Apply division holidays from FREE_DAY_SETTINGS
         holidays = FREE_DAY_SETTINGS.get((str(sem), normalize_token(div)), [])
+        if holidays:
+            # logged once here; the placement loops never see these days as free
+            logger.info("[HOLIDAY] Sem%s Div%s has no classes on %s", sem, div, ", ".join(holidays))
         for hday in holidays:
-            for slot in SHIFT_SLOTS[div_shift]:
-                if "Break" in slot or "Lunch" in slot:
-                    continue
-                tbl[hday][slot] = f"{FREE_DAY_LABEL} (Sem{sem} Div{div})"
+            mark_free_day(tbl, hday, sem, div)
 
         dtables[key] = {"shift": div_shift, "table": tbl}
 
     return dtables[key]["table"], dtables[key]["shift"]
 
-# ---------- Holiday check helper ----------
-def is_division_holiday(sem, div, day):
+# ---------- Placement kernels (day masks only, no table access) ----------
+def first_free_slot(days, fmasks, dmasks, allowed):
     """
-    Normalize sem/div keys and check if this day is marked as a holiday
-    in FREE_DAY_SETTINGS.
+    First day of `days` on which some bit of `allowed` is free in both
+    {day: mask} dicts, as (day, lowest such bit), else (None, 0).
     """
-    key = (str(sem), normalize_token(div))
-    return day in FREE_DAY_SETTINGS.get(key, [])
+    for day in days:
+        m = fmasks[day] & dmasks[day] & allowed
+        if m:
+            return day, m & -m
+    return None, 0
 
-
-def lock_theory(ftbl, dtbl, fshift, dshift, fname, sem, div, subject, avoid_dup=True):
-    for day in random.sample(DAYS, len(DAYS)):
-        if avoid_dup and day_has_division(dtbl, day, sem, div):
-            continue
-        if avoid_dup and day_has_subject(dtbl, day, subject):
-            continue
-        # skip if division day is a holiday
-        if is_division_holiday(sem, div, day):
-            logger.info("[HOLIDAY-SKIP] Skipping Sem%s Div%s on %s", sem, div, day)
+def first_free_pair(days, fmasks, dmasks, lab_pairs):
+    """
+    First day of `days` on which a pair of `lab_pairs` (a LAB_PAIRS entry) is
+    free in both {day: mask} dicts, as (day, faculty_pair, division_pair),
+    else (None, None, None).
+    """
+    for day in days:
+        both = fmasks[day] & dmasks[day]
+        if not both:
             continue
-
-
-        for fslot in SHIFT_SLOTS[fshift]:
-            if "Break" in fslot or "Lunch" in fslot: continue
-            if not free_slot(ftbl, day, fslot): continue
-            for dslot in SHIFT_SLOTS[dshift]:
-                if "Break" in dslot or "Lunch" in dslot: continue
-                if not free_slot(dtbl, day, dslot): continue
-                if not slots_equivalent(fshift, fslot, dshift, dslot): continue
-                if not division_slot_allowed_for_faculty(fshift, dshift, dslot): continue
-                ftbl[day][fslot] = f"{subject} (Sem{sem} Div{div})"
-                dtbl[day][dslot] = f"{subject} ({fname})"
-                logger.info(f"[SUCCESS] Theory: {subject} assigned by {fname} -> Sem{sem} Div{div} at {day} F={fslot} D={dslot}")
-                return True
-    for day in random.sample(DAYS, len(DAYS)):
-        for fslot in SHIFT_SLOTS[fshift]:
-            if "Break" in fslot or "Lunch" in fslot: continue
-            if not free_slot(ftbl, day, fslot): continue
-            for dslot in SHIFT_SLOTS[dshift]:
-                if "Break" in dslot or "Lunch" in dslot: continue
-                if not free_slot(dtbl, day, dslot): continue
-                if not slots_equivalent(fshift, fslot, dshift, dslot): continue
-                if not division_slot_allowed_for_faculty(fshift, dshift, dslot): continue
-                ftbl[day][fslot] = f"{subject} (Sem{sem} Div{div})"
-                dtbl[day][dslot] = f"{subject} ({fname})"
-                logger.info(f"[SUCCESS] Theory (fallback): {subject} assigned by {fname} -> Sem{sem} Div{div} at {day} F={fslot} D={dslot}")
-                return True
-    logger.debug(f"[TRY-FAIL] Theory: {subject} not placed (yet) for {fname} Sem{sem} Div{div}")
+        for m, fpair, dpair in lab_pairs:
+            if both & m == m:
+                return day, fpair, dpair
+    return None, None, None
+
+def pair_days(lab_pairs, days, masks):
+    """pair_mask -> first day of `days` with that whole pair free in `masks` (or None)."""
+    return {m: next((d for d in days if masks[d] & m == m), None) for m, _, _ in lab_pairs}
+
+def open_days(dtbl, days, subject):
+    """`days` without those on which the division already has `subject`."""
+    skey = _subject_key(subject)
+    return [d for d in days if skey not in dtbl.subjects[d]]
+
+
+def lock_theory(ftbl, dtbl, fshift, dshift, fname, sem, div, subject, avoid_dup=True, rng=random):
+    allowed = ALLOWED_SLOTS[(fshift, dshift)]
+    # one random order of the division's working days per call, shared by
+    # the strict and fallback passes
+    day_order = list(dtbl.workdays)
+    rng.shuffle(day_order)
+    # try the division's emptiest days first (stable: ties keep the random order)
+    day_order.sort(key=lambda d: -POPCOUNT[dtbl.free[d]])
+    days = open_days(dtbl, day_order, subject) if avoid_dup else day_order
+    day, bit = first_free_slot(days, ftbl.free, dtbl.free, allowed)
+    if bit:
+        fslot, dslot = BIT_SLOT[fshift][bit], BIT_SLOT[dshift][bit]
+        occupy(ftbl, day, fslot, faculty_cell(subject, sem, div))
+        occupy(dtbl, day, dslot, division_cell(subject, fname), subject=subject)
+        logger.info("[SUCCESS] Theory: %s assigned by %s -> Sem%s Div%s at %s F=%s D=%s",
+                    subject, fname, sem, div, day, fslot, dslot)
+        return True
+    day, bit = first_free_slot(day_order, ftbl.free, dtbl.free, allowed)
+    if bit:
+        fslot, dslot = BIT_SLOT[fshift][bit], BIT_SLOT[dshift][bit]
+        occupy(ftbl, day, fslot, faculty_cell(subject, sem, div))
+        occupy(dtbl, day, dslot, division_cell(subject, fname), subject=subject)
+        logger.info("[SUCCESS] Theory (fallback): %s assigned by %s -> Sem%s Div%s at %s F=%s D=%s",
+                    subject, fname, sem, div, day, fslot, dslot)
+        return True
+    logger.debug("[TRY-FAIL] Theory: %s not placed (yet) for %s Sem%s Div%s", subject, fname, sem, div)
     return False
 
-def lock_lab(ftbl, dtbl, fshift, dshift, fname, sem, div, subject, batch_label, avoid_dup=True):
-    fpairs = consecutive_pairs_for_shift(fshift)
-    dpairs = consecutive_pairs_for_shift(dshift)
-    for day in random.sample(DAYS, len(DAYS)):
-        if avoid_dup and day_has_division(dtbl, day, sem, div):
-            continue
-        if avoid_dup and day_has_subject(dtbl, day, subject):
-            continue
-        # skip if division day is a holiday
-        if is_division_holiday(sem, div, day):
-            logger.info("[HOLIDAY-SKIP] Skipping Sem%s Div%s on %s", sem, div, day)
-            continue
-
-
-        for (fs1, fs2) in fpairs:
-            if not free_pair(ftbl, day, fs1, fs2): continue
-            for (ds1, ds2) in dpairs:
-                if not free_pair(dtbl, day, ds1, ds2): continue
-                if not pair_slots_equivalent(fshift, fs1, fs2, dshift, ds1, ds2): continue
-                if not division_pair_allowed_for_faculty(fshift, dshift, (ds1, ds2)): continue
-                ftbl[day][fs1] = f"{subject} Lab (Sem{sem} Div{div}) [{batch_label}]"; ftbl[day][fs2] = "MERGE"
-                dtbl[day][ds1] = f"{subject} Lab ({fname}) [{batch_label}]"; dtbl[day][ds2] = "MERGE"
-                logger.info(f"[SUCCESS] Lab: {subject} ({batch_label}) assigned by {fname} -> Sem{sem} Div{div} at {day} F=({fs1},{fs2}) D=({ds1},{ds2})")
+def lock_lab(ftbl, dtbl, fshift, dshift, fname, sem, div, subject, batch_label, avoid_dup=True, rng=random):
+    lab_pairs = LAB_PAIRS[(fshift, dshift)]
+    day_order = list(dtbl.workdays)
+    rng.shuffle(day_order)
+    days = open_days(dtbl, day_order, subject) if avoid_dup else day_order
+    day, fpair, dpair = first_free_pair(days, ftbl.free, dtbl.free, lab_pairs)
+    if day is not None:
+        (fs1, fs2), (ds1, ds2) = fpair, dpair
+        occupy(ftbl, day, fs1, faculty_cell(subject, sem, div, batch_label)); occupy(ftbl, day, fs2, "MERGE")
+        occupy(dtbl, day, ds1, division_cell(subject, fname, batch_label), subject=subject); occupy(dtbl, day, ds2, "MERGE")
+        logger.info("[SUCCESS] Lab: %s (%s) assigned by %s -> Sem%s Div%s at %s F=(%s,%s) D=(%s,%s)",
+                    subject, batch_label, fname, sem, div, day, fs1, fs2, ds1, ds2)
+        return True
+    # flexible pass: faculty and division days may differ; the faculty may
+    # use any day, the division only its working days, each order drawn once
+    fday_order = DAYS[:]
+    rng.shuffle(fday_order)
+    dday_order = list(dtbl.workdays)
+    rng.shuffle(dday_order)
+    # the division day each pair would get does not depend on the faculty
+    # day, so find it once per pair instead of rescanning inside the loop
+    dday_for = pair_days(lab_pairs, dday_order, dtbl.free)
+    for fday in fday_order:
+        ffree = ftbl.free[fday]
+        for m, (fs1, fs2), (ds1, ds2) in lab_pairs:
+            dday = dday_for[m]
+            if dday is not None and ffree & m == m:
+                occupy(ftbl, fday, fs1, faculty_cell(subject, sem, div, batch_label)); occupy(ftbl, fday, fs2, "MERGE")
+                occupy(dtbl, dday, ds1, division_cell(subject, fname, batch_label), subject=subject); occupy(dtbl, dday, ds2, "MERGE")
+                logger.info("[SUCCESS-FLEX] Lab: %s (%s) assigned by %s -> Sem%s Div%s Fday=%s Dday=%s",
+                            subject, batch_label, fname, sem, div, fday, dday)
                 return True
-    for fday in random.sample(DAYS, len(DAYS)):
-        for (fs1, fs2) in fpairs:
-            if not free_pair(ftbl, fday, fs1, fs2): continue
-            for dday in random.sample(DAYS, len(DAYS)):
-                if avoid_dup and day_has_division(dtbl, dday, sem, div):
-                    continue
-                for (ds1, ds2) in dpairs:
-                    if not free_pair(dtbl, dday, ds1, ds2): continue
-                    if not pair_slots_equivalent(fshift, fs1, fs2, dshift, ds1, ds2): continue
-                    if not division_pair_allowed_for_faculty(fshift, dshift, (ds1, ds2)): continue
-                    ftbl[fday][fs1] = f"{subject} Lab (Sem{sem} Div{div}) [{batch_label}]"; ftbl[fday][fs2] = "MERGE"
-                    dtbl[dday][ds1] = f"{subject} Lab ({fname}) [{batch_label}]"; dtbl[dday][ds2] = "MERGE"
-                    logger.info(f"[SUCCESS-FLEX] Lab: {subject} ({batch_label}) assigned by {fname} -> Sem{sem} Div{div} Fday={fday} Dday={dday}")
-                    return True
-    logger.debug(f"[TRY-FAIL] Lab: {subject} not placed (yet) for {fname} Sem{sem} Div{div} [{batch_label}]")
+    logger.debug("[TRY-FAIL] Lab: %s not placed (yet) for %s Sem%s Div%s [%s]", subject, fname, sem, div, batch_label)
     return False
 
 # ---------- Force (deterministic) passes (use canonical equality) ----------
 def force_place_theory(ftbl, dtbl, fshift, dshift, fname, sem, div, subject):
     logger_force = logging.getLogger("force_theory")
-    fslots = [s for s in SHIFT_SLOTS[fshift] if "Break" not in s and "Lunch" not in s]
-    dslots = [s for s in SHIFT_SLOTS[dshift] if "Break" not in s and "Lunch" not in s]
-
-    for day in DAYS:
-        # ⬇️ check here first
-        if is_division_holiday(sem, div, day):
-            logger.info("[HOLIDAY-SKIP] Skipping Sem%s Div%s on %s", sem, div, day)
-            continue
-
-        for fs in fslots:
-            if not free_slot(ftbl, day, fs): 
-                continue
-            for ds in dslots:
-                if not free_slot(dtbl, day, ds): continue
-                if not slots_equivalent(fshift, fs, dshift, ds): continue
-                if not division_slot_allowed_for_faculty(fshift, dshift, ds): continue
-                ftbl[day][fs] = f"{subject} (Sem{sem} Div{div})"
-                dtbl[day][ds] = f"{subject} ({fname})"
-                logger_force.warning("[FORCE] THEORY forced: %s -> Sem%s Div%s at %s F=%s D=%s",
-                                    fname, sem, div, day, fs, ds)
-                return True
+    allowed = ALLOWED_SLOTS[(fshift, dshift)]
+
+    day, bit = first_free_slot(dtbl.workdays, ftbl.free, dtbl.free, allowed)
+    if bit:
+        fs, ds = BIT_SLOT[fshift][bit], BIT_SLOT[dshift][bit]
+        occupy(ftbl, day, fs, faculty_cell(subject, sem, div))
+        occupy(dtbl, day, ds, division_cell(subject, fname), subject=subject)
+        logger_force.warning("[FORCE] THEORY forced: %s -> Sem%s Div%s at %s F=%s D=%s",
+                            fname, sem, div, day, fs, ds)
+        return True
 
 
-    for dday in DAYS:
-        for ds in dslots:
-            if not free_slot(dtbl, dday, ds): continue
+    for dday in dtbl.workdays:
+        dmask = dtbl.free[dday] & allowed
+        while dmask:
+            bit = dmask & -dmask
+            dmask ^= bit
+            ds = BIT_SLOT[dshift][bit]
             for fday in DAYS:
-                for fs in fslots:
-                    if not free_slot(ftbl, fday, fs): continue
-                    if not slots_equivalent(fshift, fs, dshift, ds): continue
-                    if not division_slot_allowed_for_faculty(fshift, dshift, ds): continue
-                    ftbl[fday][fs] = f"{subject} (Sem{sem} Div{div})"; dtbl[dday][ds] = f"{subject} ({fname})"
-                    logger_force.warning("[FORCE-RELAX] THEORY forced (relaxed): %s -> Sem%s Div%s Fday=%s Dday=%s", fname, sem, div, fday, dday)
-                    return True
+                if not ftbl.free[fday] & bit: continue
+                fs = BIT_SLOT[fshift][bit]
+                occupy(ftbl, fday, fs, faculty_cell(subject, sem, div)); occupy(dtbl, dday, ds, division_cell(subject, fname), subject=subject)
+                logger_force.warning("[FORCE-RELAX] THEORY forced (relaxed): %s -> Sem%s Div%s Fday=%s Dday=%s", fname, sem, div, fday, dday)
+                return True
 
     logger_force.error("[FAILED FORCE] THEORY unable to force-place %s Sem%s Div%s", subject, sem, div)
     return False
 
 def force_place_lab(ftbl, dtbl, fshift, dshift, fname, sem, div, subject, batch_label):
     logger_force = logging.getLogger("force_lab")
-    fpairs = consecutive_pairs_for_shift(fshift)
-    dpairs = consecutive_pairs_for_shift(dshift)
-
-    for day in DAYS:
-        # ⬇️ holiday check here
-        if is_division_holiday(sem, div, day):
-            logger.info("[HOLIDAY-SKIP] Skipping Sem%s Div%s on %s", sem, div, day)
-            continue
+    lab_pairs = LAB_PAIRS[(fshift, dshift)]
+
+    day, fpair, dpair = first_free_pair(dtbl.workdays, ftbl.free, dtbl.free, lab_pairs)
+    if day is not None:
+        (fs1, fs2), (ds1, ds2) = fpair, dpair
+        occupy(ftbl, day, fs1, faculty_cell(subject, sem, div, batch_label))
+        occupy(ftbl, day, fs2, "MERGE")
+        occupy(dtbl, day, ds1, division_cell(subject, fname, batch_label), subject=subject)
+        occupy(dtbl, day, ds2, "MERGE")
+        logger_force.warning("[FORCE] LAB forced: %s -> Sem%s Div%s at %s F=(%s,%s) D=(%s,%s)",
+                            fname, sem, div, day, fs1, fs2, ds1, ds2)
+        return True
 
-        for (fs1, fs2) in fpairs:
-            if not free_pair(ftbl, day, fs1, fs2): continue
-            for (ds1, ds2) in dpairs:
-                if not free_pair(dtbl, day, ds1, ds2): continue
-                if not pair_slots_equivalent(fshift, fs1, fs2, dshift, ds1, ds2): continue
-                if not division_pair_allowed_for_faculty(fshift, dshift, (ds1, ds2)): continue
-                ftbl[day][fs1] = f"{subject} Lab (Sem{sem} Div{div}) [{batch_label}]"
-                ftbl[day][fs2] = "MERGE"
-                dtbl[day][ds1] = f"{subject} Lab ({fname}) [{batch_label}]"
-                dtbl[day][ds2] = "MERGE"
-                logger_force.warning("[FORCE] LAB forced: %s -> Sem%s Div%s at %s F=(%s,%s) D=(%s,%s)",
-                                    fname, sem, div, day, fs1, fs2, ds1, ds2)
+    fday_for = pair_days(lab_pairs, DAYS, ftbl.free)
+    for dday in dtbl.workdays:
+        dfree = dtbl.free[dday]
+        for m, (fs1, fs2), (ds1, ds2) in lab_pairs:
+            fday = fday_for[m]
+            if fday is not None and dfree & m == m:
+                occupy(ftbl, fday, fs1, faculty_cell(subject, sem, div, batch_label)); occupy(ftbl, fday, fs2, "MERGE")
+                occupy(dtbl, dday, ds1, division_cell(subject, fname, batch_label), subject=subject); occupy(dtbl, dday, ds2, "MERGE")
+                logger_force.warning("[FORCE-RELAX] LAB forced (relaxed): %s -> Sem%s Div%s Fday=%s Dday=%s", fname, sem, div, fday, dday)
                 return True
 
-                
-
-    for dday in DAYS:
-        for (ds1, ds2) in dpairs:
-            if not free_pair(dtbl, dday, ds1, ds2): continue
-            for fday in DAYS:
-                for (fs1, fs2) in fpairs:
-                    if not free_pair(ftbl, fday, fs1, fs2): continue
-                    if not pair_slots_equivalent(fshift, fs1, fs2, dshift, ds1, ds2): continue
-                    ftbl[fday][fs1] = f"{subject} Lab (Sem{sem} Div{div}) [{batch_label}]"; ftbl[fday][fs2] = "MERGE"
-                    dtbl[dday][ds1] = f"{subject} Lab ({fname}) [{batch_label}]"; dtbl[dday][ds2] = "MERGE"
-                    logger_force.warning("[FORCE-RELAX] LAB forced (relaxed): %s -> Sem%s Div%s Fday=%s Dday=%s", fname, sem, div, fday, dday)
-                    return True
-
     logger_force.error("[FAILED FORCE] LAB unable to place %s Sem%s Div%s", subject, sem, div)
     return False
-def assign_subjects_for_faculty(f, ftables, dtables):
-    fname = f["Name"]
-    fshift = f["Shift"]
-    fsubjects = f["Subjects"]
+def placement_domain(entry, fshift, dtbl):
+    """
+    Rough count of (day, slot) choices one session of `entry` has: allowed
+    slots (or lab pairs) per day for the shift combination, times the
+    division's days that are not free days.
+    """
+    key = (fshift, entry["Div_Shift"])
+    per_day = len(LAB_PAIRS[key]) if entry["Type"] == "Lab" else POPCOUNT[ALLOWED_SLOTS[key]]
+    return per_day * sum(1 for d in DAYS if dtbl.free[d])
 
-    if fname not in ftables:
-        ftables[fname] = empty_table_for_shift(fshift)
-    ftbl = ftables[fname]
+def assign_subjects(faculties, ftables, dtables, rng=random):
+    """
+    Schedules every subject entry of `faculties`, most constrained first
+    (labs, then the smallest placement domain, then the largest demand and
+    the busiest faculty), and force-places whatever the random passes could
+    not fit once everything has had a try.
+    """
+    entries = []
+    for f in faculties:
+        fname, fshift = f["Name"], f["Shift"]
+        if fname not in ftables:
+            ftables[fname] = empty_table_for_shift(fshift)
+        ftbl = ftables[fname]
+        needs = [slots_needed(e) for e in f["Subjects"]]
+        load = sum(needs)
+        for entry, need in zip(f["Subjects"], needs):
+            if entry["Type"] == "Lab":
+                # one lab session per batch (a grouped batch is a single session)
+                batches = entry["Batches"][:1] if entry.get("Batches_Grouped", False) else entry["Batches"]
+            elif entry["Type"] == "Theory":
+                batches = None
+            else:
+                continue
+            dtbl, _ = ensure_div_table(dtables, entry["Semester"], entry["Division"], entry["Div_Shift"])
+            key = (batches is None, placement_domain(entry, fshift, dtbl), -need, -load)
+            entries.append((key, f, ftbl, dtbl, entry, batches))
+    entries.sort(key=lambda t: t[0])  # stable: ties keep input order
 
     pending = []
-
-    # Labs
-    for entry in [s for s in fsubjects if s["Type"] == "Lab"]:
+    for _, f, ftbl, dtbl, entry, batches in entries:
+        fname, fshift = f["Name"], f["Shift"]
         sem = entry["Semester"]
         div = entry["Division"]
         sub = entry["Subject"]
         dshift = entry["Div_Shift"]
-        dtbl, _ = ensure_div_table(dtables, sem, div, dshift)
-        batches = entry["Batches"] if not entry.get("Batches_Grouped", False) else [entry["Batches"][0]]
-        for batch in batches:
-            for _ in range(entry["Num_Labs"]):
-                ok = lock_lab(ftbl, dtbl, fshift, dshift, fname, sem, div, sub, batch, avoid_dup=True)
-                if not ok:
-                    pending.append({
-                        "Type":"Lab","Semester":sem,"Division":div,"Div_Shift":dshift,
-                        "Subject":sub,"Batch":batch,"Faculty":fname,"FShift":fshift
-                    })
+        if batches is not None:
+            for batch in batches:
+                for _ in range(entry["Num_Labs"]):
+                    # forward check: a division without two free slots cannot take a lab
+                    if dtbl.free_count < 2 or ftbl.free_count < 2:
+                        pending.append((f, ftbl, dtbl, entry, batch))
+                        continue
+                    if not lock_lab(ftbl, dtbl, fshift, dshift, fname, sem, div, sub, batch, avoid_dup=True, rng=rng):
+                        pending.append((f, ftbl, dtbl, entry, batch))
+        else:
+            for _ in range(entry["Theory_Classes"]):
+                if not dtbl.free_count or not ftbl.free_count:
+                    pending.append((f, ftbl, dtbl, entry, None))
+                    continue
+                if not lock_theory(ftbl, dtbl, fshift, dshift, fname, sem, div, sub, avoid_dup=True, rng=rng):
+                    pending.append((f, ftbl, dtbl, entry, None))
 
-    # Theories
-    for entry in [s for s in fsubjects if s["Type"] == "Theory"]:
+    # Force-fill pending tasks
+    for f, ftbl, dtbl, entry, batch in pending:
+        fname, fshift = f["Name"], f["Shift"]
         sem = entry["Semester"]
         div = entry["Division"]
         sub = entry["Subject"]
         dshift = entry["Div_Shift"]
-        dtbl, _ = ensure_div_table(dtables, sem, div, dshift)
-        for _ in range(entry["Theory_Classes"]):
-            ok = lock_theory(ftbl, dtbl, fshift, dshift, fname, sem, div, sub, avoid_dup=True)
-            if not ok:
-                pending.append({
-                    "Type":"Theory","Semester":sem,"Division":div,"Div_Shift":dshift,
-                    "Subject":sub,"Faculty":fname,"FShift":fshift
-                })
 
-    # Force-fill pending tasks
-    for task in pending:
-        typ = task["Type"]
-        sem = task["Semester"]
-        div = task["Division"]
-        sub = task["Subject"]
-        batch = task.get("Batch", None)
-        fshift_task = task.get("FShift", fshift)
-        dshift = task["Div_Shift"]
-
-        dtbl, _ = ensure_div_table(dtables, sem, div, dshift)
-
-        if typ == "Theory":
-            force_place_theory(ftbl, dtbl, fshift_task, dshift, fname, sem, div, sub)
+        if batch is None:
+            force_place_theory(ftbl, dtbl, fshift, dshift, fname, sem, div, sub)
         else:
-            force_place_lab(ftbl, dtbl, fshift_task, dshift, fname, sem, div, sub, batch)
+            force_place_lab(ftbl, dtbl, fshift, dshift, fname, sem, div, sub, batch)
 
+def assign_subjects_for_faculty(f, ftables, dtables, rng=random):
+    assign_subjects([f], ftables, dtables, rng=rng)
 
 
+
+# ---------- Capacity check (before scheduling) ----------
+def teaching_slots_per_week(shift, free_days=()):
+    per_day = len(TEACHING_SLOTS[shift])
+    return per_day * sum(1 for d in DAYS if d not in free_days)
+
+def slots_needed(entry):
+    """Teaching slots one subject entry asks for, counted the way it is scheduled."""
+    if entry["Type"] == "Lab":
+        batches = 1 if entry.get("Batches_Grouped", False) else len(entry.get("Batches", []))
+        return 2 * int(entry.get("Num_Labs", 0)) * batches
+    return int(entry.get("Theory_Classes", 0))
+
+def find_overbooked(faculties):
+    """
+    Return a message for every faculty and every Sem/Div whose requested
+    sessions need more teaching slots than its week has. Such input can never
+    be fully placed and only drives the scheduler through its force passes.
+    """
+    problems = []
+    div_need, div_shift, div_free = {}, {}, {}
+    for f in faculties:
+        need = 0
+        for s in f.get("Subjects", []):
+            n = slots_needed(s)
+            need += n
+            key = (str(s.get("Semester")), normalize_token(s.get("Division")))
+            div_need[key] = div_need.get(key, 0) + n
+            div_shift.setdefault(key, s.get("Div_Shift", "8-3"))
+            if s.get("Holidays"):
+                div_free[key] = s["Holidays"]
+        have = teaching_slots_per_week(f["Shift"])
+        if need > have:
+            problems.append(f"{f['Name']} needs {need} slots but the {f['Shift']} shift has {have}")
+    for (sem, div), need in div_need.items():
+        have = teaching_slots_per_week(div_shift[(sem, div)], div_free.get((sem, div), ()))
+        if need > have:
+            problems.append(f"Sem{sem} Div{div} needs {need} slots but only {have} are free")
+    return problems
+
 # ---------- Apply free-days to division tables (before scheduling) ----------
 def apply_free_day_markings_from_inputs(dtables, faculties):
     """
     Walks through faculty inputs to identify divisions and apply FREE_DAY_SETTINGS
     by pre-filling division tables' slots for the selected days.
     """
-    # gather unique (sem,div) -> div_shift
+    # (sem,div) -> div_shift, only needed for divisions without a table yet
     div_shift_map = {}
-    for f in faculties:
-        for s in f["Subjects"]:
-            key = (s["Semester"], s["Division"])
-            if key not in div_shift_map:
-                div_shift_map[key] = s.get("Div_Shift", "8-3")
+    if any(key not in dtables for key in FREE_DAY_SETTINGS):
+        for f in faculties:
+            for s in f["Subjects"]:
+                div_shift_map.setdefault((s["Semester"], s["Division"]), s.get("Div_Shift", "8-3"))
     # apply free-day settings
     for (sem, div), days in list(FREE_DAY_SETTINGS.items()):
         key = (sem, div)
         div_shift = div_shift_map.get(key, "8-3")
         dtbl, _ = ensure_div_table(dtables, sem, div, div_shift)
-        # fill every slot on each selected day with FREE_DAY_LABEL + sem/div info
+        # fill every teaching slot on each selected day with FREE_DAY_LABEL + sem/div
+        # info; breaks keep their own labels, as in ensure_div_table. Tables
+        # created by ensure_div_table already carry these days.
         for day in days:
             if day not in dtbl:
                 logger.debug("Requested free day %s not in day-list (skipping): %s", day, key)
                 continue
-            for slot in list(dtbl[day].keys()):
-                dtbl[day][slot] = f"{FREE_DAY_LABEL} (Sem{sem} Div{div})"
+            if day in dtbl.workdays:
+                mark_free_day(dtbl, day, sem, div)
         logger.info("Applied free-day marking for Sem%s Div%s => %s", sem, div, days)
 
 # ---------- Excel export helpers (same behavior & styling) ----------
-def dataframe_from_table(table, shift):
-    cols = SHIFT_SLOTS[shift]
-    df = pd.DataFrame.from_dict(table, orient="index")
-    for c in cols:
-        if c not in df.columns:
-            df[c] = ""
-    df = df[cols]
-    df.index.name = "Day/Time"
-    return df
-
 COLOR_PALETTE = [
     "FFB3E5FC","FFFFF9C4","FFC8E6C9","FFFFCCBC","FFD7CCC8","FFE1BEE7",
     "FFFFCDD2","FFFFECB3","FFB2EBF2","FFC5CAE9","FFF8BBD0","FFE6EE9C",
     "FFBBDEFB","FFC8E6C9","FFF0F4C3","FFFFF59D","FFB39DDB"
 ]
 
+# Shared style objects: openpyxl styles are immutable, so every cell can
+# point at the same instance instead of allocating its own.
+CENTER_WRAP = Alignment(horizontal="center", vertical="center", wrap_text=True)
+HEADER_FONTS = {(size, True): Font(name="Times New Roman", size=size, bold=True) for size in (12, 13, 14, 16)}
+# "Day/Time" + slot header row of each shift, laid out once and shared by every sheet
+HEADER_ROWS = {sh: [(v, None, None) for v in ["Day/Time", *slots]] for sh, slots in SHIFT_SLOTS.items()}
+
+@functools.lru_cache(maxsize=None)
+def solid_fill(hexcolor):
+    """
+    Solid PatternFill for a colour, built once per colour. COLOR_PALETTE holds
+    ARGB; a plain RRGGBB is made opaque, as openpyxl would read it with alpha 00.
+    """
+    if len(hexcolor) == 6:
+        hexcolor = "FF" + hexcolor
+    return PatternFill(start_color=hexcolor, end_color=hexcolor, fill_type="solid")
+
 def build_subject_color_map(ftables, dtables):
-    subjects = OrderedDict()
+    # most cells repeat across tables (breaks, MERGE, shared subjects), so
+    # collect distinct cell texts in first-seen order and parse each once
+    cells = {}
     def collect_from_table(tbl):
         for day in DAYS:
-            row = tbl.get(day, {})
-            for v in row.values():
-                s = extract_subject_from_cell(v)
-                if s and s not in subjects:
-                    subjects[s] = None
+            cells.update(dict.fromkeys(tbl.get(day, {}).values()))
     for tbl in ftables.values(): collect_from_table(tbl)
     for payload in dtables.values(): collect_from_table(payload["table"])
-    mapping = {}
-    for i, s in enumerate(list(subjects.keys())):
-        mapping[s] = COLOR_PALETTE[i % len(COLOR_PALETTE)]
-    return mapping
+    subjects = dict.fromkeys(filter(None, map(extract_subject_from_cell, cells)))
+    return {s: COLOR_PALETTE[i % len(COLOR_PALETTE)] for i, s in enumerate(subjects)}
 
 def save_excel_with_merges_and_summary(
     filename,
@@ -734,21 +971,8 @@ def save_excel_with_merges_and_summary(
     department="",
     academic=""
 ):
-    safe_table = {}
-    for day, row in table.items():
-        newrow = {}
-        for k, v in row.items():
-            if v == "MERGE":
-                newrow[k] = ""
-            else:
-                newrow[k] = v
-        safe_table[day] = newrow
-
-    df = dataframe_from_table(safe_table, shift)
-    df.to_excel(filename, sheet_name="Timetable", index=True)
-
-    wb = load_workbook(filename)
-    ws = wb.active
+    cols = SHIFT_SLOTS[shift]
+    ncols = 1 + len(cols)
 
     if header_type == "faculty" and faculty_obj:
         display_name = faculty_obj.get("Full_Name", faculty_obj["Name"])
@@ -768,161 +992,227 @@ def save_excel_with_merges_and_summary(
     else:
         header_lines = []
 
-    for idx, (text, size, bold) in enumerate(header_lines, start=1):
-        ws.insert_rows(idx)
-        ws.merge_cells(start_row=idx, start_column=1, end_row=idx, end_column=ws.max_column)
-        cell = ws.cell(row=idx, column=1)
-        cell.value = text
-        cell.font = Font(name="Times New Roman", size=size, bold=bold)
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+    # Lay the sheet out once: rows of (value, title font key, fill colour)
+    # cells ([] is an empty row) and single-row merges (row, first col,
+    # last col), all 0-based. Either writer below renders it. A merged range
+    # is drawn with its top-left cell's style, so the cells it covers are
+    # None (unstyled) or simply left off the end of the row.
+    rows = []
+    merges = []
 
-    for col_idx in range(1, ws.max_column + 1):
-        ws.column_dimensions[get_column_letter(col_idx)].width = 24
+    # title lines, each merged across the grid
+    for idx, (text, size, bold) in enumerate(header_lines):
+        merges.append((idx, 0, ncols - 1))
+        rows.append([(text, (size, bold), None)])
 
-    cols = SHIFT_SLOTS[shift]
-    header_to_col = {name: idx for idx, name in enumerate(["Day/Time"] + cols, start=1)}
+    rows.append(HEADER_ROWS[shift])
 
-    # merges for lab slots
-    for r_idx, day in enumerate(DAYS, start=2 + len(header_lines)):
+    # day rows; a lab's "MERGE" cell is blank and merged into the cell on its
+    # left. Only the first len(DAYS) - 1 day rows are colored, as before.
+    colored_days = DAYS[:-1] if subject_color_map else ()
+    for day in DAYS:
         row_orig = table.get(day, {})
-        for i, col_name in enumerate(cols):
-            val = row_orig.get(col_name, "")
-            if val == "MERGE":
-                left_col_name = cols[i - 1] if i - 1 >= 0 else None
-                if left_col_name:
-                    left_col = header_to_col[left_col_name]
-                    right_col = header_to_col[col_name]
-                    left_val = ws.cell(row=r_idx, column=left_col).value
-                    if left_val not in (None, ""):
-                        try:
-                            ws.merge_cells(
-                                start_row=r_idx,
-                                start_column=left_col,
-                                end_row=r_idx,
-                                end_column=right_col,
-                            )
-                        except Exception:
-                            pass
-                        ws.cell(row=r_idx, column=left_col).alignment = Alignment(
-                            horizontal="center", vertical="center", wrap_text=True
-                        )
-
-    # coloring timetable cells
-    if subject_color_map:
-        merged_ranges = list(ws.merged_cells.ranges)
-
-        def fill_for_hex(hexcolor):
-            return PatternFill(start_color=hexcolor, end_color=hexcolor, fill_type="solid")
-
-        top_rows_start = 1 + len(header_lines)
-        top_rows_end = top_rows_start + len(DAYS) - 1
-        for r in range(top_rows_start + 1, top_rows_end + 1):
-            for c in range(2, 2 + len(cols)):
-                cell = ws.cell(row=r, column=c)
-                val = cell.value
-                subj = extract_subject_from_cell(val)
-                if subj and subj in subject_color_map:
-                    fill = fill_for_hex(subject_color_map[subj])
-                    applied = False
-                    for mr in merged_ranges:
-                        if (r >= mr.min_row and r <= mr.max_row) and (
-                            c >= mr.min_col and c <= mr.max_col
-                        ):
-                            for rr in range(mr.min_row, mr.max_row + 1):
-                                for cc in range(mr.min_col, mr.max_col + 1):
-                                    ws.cell(row=rr, column=cc).fill = fill
-                            applied = True
-                            break
-                    if not applied:
-                        cell.fill = fill
-
-    # center align everything
-    for row in ws.iter_rows(
-        min_row=1, max_row=1 + len(DAYS) + len(header_lines), min_col=1, max_col=1 + len(cols)
-    ):
-        for c in row:
-            c.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-
-    # bottom summary
+        raw = [row_orig.get(c, "") for c in cols]
+        values = ["" if v == "MERGE" else v for v in raw]
+        for i in range(1, len(cols)):
+            if raw[i] == "MERGE" and values[i - 1] not in (None, ""):
+                merges.append((len(rows), i, i + 1))
+                values[i] = None
+
+        # free slots ("") and merge-covered cells (None) are never parsed
+        if day in colored_days:
+            colors = [subject_color_map.get(extract_subject_from_cell(v)) if v else None for v in values]
+        else:
+            colors = [None] * len(cols)
+        rows.append([(day, None, None)] + [None if v is None else (v, None, c) for v, c in zip(values, colors)])
+
+    # bottom summary, after one empty row
     if bottom_summary_rows:
-        start_row = ws.max_row + 2
+        rows.append([])
         if bottom_summary_header:
-            for j, h in enumerate(bottom_summary_header, start=1):
-                ws.cell(row=start_row, column=j).value = h
-                ws.cell(row=start_row, column=j).alignment = Alignment(
-                    horizontal="center", vertical="center", wrap_text=True
-                )
-            start_row += 1
+            rows.append([(h, None, None) for h in bottom_summary_header])
         for rdata in bottom_summary_rows:
-            for j, val in enumerate(rdata, start=1):
-                ws.cell(row=start_row, column=j).value = val
-                ws.cell(row=start_row, column=j).alignment = Alignment(
-                    horizontal="center", vertical="center", wrap_text=True
-                )
-            start_row += 1
-
-    wb.save(filename)
+            rows.append([(val, None, None) for val in rdata])
+
+    if xlsxwriter is not None:
+        _write_sheet_xlsxwriter(filename, rows, merges, ncols)
+    else:
+        _write_sheet_openpyxl(filename, rows, merges, ncols)
     logger.info("Saved Excel file: %s", filename)
 
+def _write_sheet_openpyxl(filename, rows, merges, ncols):
+    # Write-only workbook: rows are streamed to the file as they are appended,
+    # so every cell gets its value and style before it goes in, and column
+    # widths and merges are declared up front.
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Timetable")
+    for col_idx in range(1, ncols + 1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = 24
+    # the layout's merges never overlap, so they go straight into the range
+    # set, without a coordinate string to parse or a containment scan each
+    ws.merged_cells.ranges.update(
+        CellRange(min_col=c1 + 1, min_row=r + 1, max_col=c2 + 1, max_row=r + 1) for r, c1, c2 in merges)
+
+    # Every cell is centred and wrapped, plus a title font or a subject fill.
+    # (A row-level style would not do: Excel only applies it to empty cells.)
+    # Registering a style with the workbook hashes each style object, so each
+    # distinct look is registered once and later cells copy its style ids.
+    cell_styles = {}  # (title (size, bold), fill colour) -> style ids
+
+    def styled(value, title=None, color=None):
+        cell = WriteOnlyCell(ws, value=value)
+        style = cell_styles.get((title, color))
+        if style is not None:
+            cell._style = copy(style)
+            return cell
+        cell.alignment = CENTER_WRAP
+        if title is not None:
+            cell.font = HEADER_FONTS.get(title) or Font(name="Times New Roman", size=title[0], bold=title[1])
+        if color is not None:
+            cell.fill = solid_fill(color)
+        cell_styles[(title, color)] = copy(cell._style)
+        return cell
+
+    for row in rows:
+        ws.append([cell and styled(*cell) for cell in row])
+    # What wb.save() does, but deflating at level 1 instead of zlib's default
+    # 6: a few KB of XML per sheet, so the faster level costs little in size.
+    # This mirrors openpyxl 3.1's Workbook.save() and writer.excel.save_workbook():
+    # a write-only workbook needs a sheet, and the modified timestamp (naive
+    # UTC) is set by the caller before ExcelWriter writes the archive.
+    if not wb.worksheets:
+        wb.create_sheet()
+    wb.properties.modified = datetime.now(timezone.utc).replace(tzinfo=None)
+    ExcelWriter(wb, ZipFile(filename, "w", ZIP_DEFLATED, allowZip64=True, compresslevel=1)).save()
+
+def _write_sheet_xlsxwriter(filename, rows, merges, ncols):
+    # constant_memory: each row is flushed to the file once the next begins,
+    # which works because rows (and the single-row merges) come in order
+    wb = xlsxwriter.Workbook(filename, {"constant_memory": True})
+    ws = wb.add_worksheet("Timetable")
+    ws.set_column(0, ncols - 1, 24)
+    merged = {(r, c1): c2 for r, c1, c2 in merges}
+
+    formats = {}  # (title (size, bold), fill colour) -> Format, one per look
+
+    def cell_format(title, color):
+        fmt = formats.get((title, color))
+        if fmt is None:
+            props = {"align": "center", "valign": "vcenter", "text_wrap": True}
+            if title is not None:
+                props.update(font_name="Times New Roman", font_size=title[0], bold=title[1])
+            if color is not None:
+                props.update(bg_color="#" + color[-6:], pattern=1)
+            fmt = formats[(title, color)] = wb.add_format(props)
+        return fmt
+
+    for r, row in enumerate(rows):
+        for c, cell in enumerate(row):
+            if cell is None:  # covered by a merge
+                continue
+            value, title, color = cell
+            fmt = cell_format(title, color)
+            if (r, c) in merged:
+                ws.merge_range(r, c, r, merged[(r, c)], value, fmt)
+            elif value is None or value == "":
+                ws.write_blank(r, c, None, fmt)
+            elif isinstance(value, str):
+                ws.write_string(r, c, value, fmt)
+            else:
+                ws.write(r, c, value, fmt)
+    wb.close()
+
 # ---------- Bottom summary builders ----------
 def build_faculty_summary_rows(faculty_obj):
     rows = []
-    subj_index = {}
+    subjects = {}  # (sem, subject) in first-seen order
+    counts = Counter()  # (sem, subject, "Theory" | "Labs") -> sessions
     for s in faculty_obj["Subjects"]:
         sem = s["Semester"]; subj = s["Subject"]
-        key = (sem, subj)
-        if key not in subj_index:
-            subj_index[key] = {"Theory": 0, "Labs": 0}
+        subjects[(sem, subj)] = None
         if s["Type"] == "Theory":
-            subj_index[key]["Theory"] += s.get("Theory_Classes", 0)
+            counts[(sem, subj, "Theory")] += s.get("Theory_Classes", 0)
         elif s["Type"] == "Lab":
             if s.get("Batches_Grouped", False):
                 blocks = s.get("Num_Labs", 0)
             else:
                 blocks = s.get("Num_Labs", 0) * max(1, len(s.get("Batches", [])))
-            subj_index[key]["Labs"] += blocks
+            counts[(sem, subj, "Labs")] += blocks
 
-    for (sem, subj), counts in subj_index.items():
-        theory = counts["Theory"]
-        labs = counts["Labs"]
+    for sem, subj in subjects:
+        theory = counts[(sem, subj, "Theory")]
+        labs = counts[(sem, subj, "Labs")]
         total = theory + labs
         rows.append([faculty_obj["Name"], faculty_obj.get("Full_Name", faculty_obj["Name"]), sem, subj, theory, labs, total])
     return rows
 
-def build_division_summary_rows(sem, div, dtbl, dtables):
+def build_course_index():
+    """
+    (sem, div, subject lower-cased) -> [(faculty full name, type, course code or "")]
+    from FACULTY_SUBJECT_COURSE, in entry order; names and codes are resolved here.
+    """
+    index = {}
+    for (fname, fsem, fdiv, fsubject, ftype), code in FACULTY_SUBJECT_COURSE.items():
+        if fsubject:
+            index.setdefault((fsem, fdiv, fsubject.strip().lower()), []).append(
+                (FACULTY_FULLNAME.get(fname, fname), ftype, code or ""))
+    return index
+
+def build_division_summary_rows(sem, div, dtbl, dtables, course_index=None):
+    if course_index is None:
+        course_index = build_course_index()
     rows = []
     seen = set()
+    done = set()  # subjects already looked up for this division
     for day in DAYS:
         row = dtbl.get(day, {})
         for val in row.values():
             subj = extract_subject_from_cell(val)
-            if subj:
-                for (fname, fsem, fdiv, fsubject, ftype), code in FACULTY_SUBJECT_COURSE.items():
-                    if fsem == sem and fdiv == div and fsubject and fsubject.strip().lower() == subj.strip().lower():
-                        fullname = FACULTY_FULLNAME.get(fname, fname)
-                        key = (subj, fullname, (code or ""), ftype)
-                        if key not in seen:
-                            if ftype == "Lab":
-                                rows.append([subj + " [Lab]", fullname, code or ""])
-                            else:
-                                rows.append([subj, fullname, code or ""])
-                            seen.add(key)
+            if subj and subj not in done:
+                done.add(subj)
+                for fullname, ftype, code in course_index.get((sem, div, subj.strip().lower()), ()):
+                    key = (subj, fullname, code, ftype)
+                    if key not in seen:
+                        if ftype == "Lab":
+                            rows.append([subj + " [Lab]", fullname, code])
+                        else:
+                            rows.append([subj, fullname, code])
+                        seen.add(key)
     return rows
 
 # ---------- Export all ----------
-def export_all(ftables, dtables, faculties_input, university="", department="", academic=""):
+def _save_workbook(task):
+    filename, table, shift, options = task
+    save_excel_with_merges_and_summary(filename, table, shift, **options)
+
+# Export tasks of the running export_all; forked workers inherit this list
+# and receive only an index, so the tables are never pickled.
+_EXPORT_TASKS = ()
+
+def _save_export(i):
+    _save_workbook(_EXPORT_TASKS[i])
+
+def available_cpus():
+    """CPUs this process may run on (its affinity mask where the OS has one)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def export_all(ftables, dtables, faculties_input, university="", department="", academic="", out_dir=".", max_workers=None):
     subject_color_map = build_subject_color_map(ftables, dtables)
+    exports = []  # (filename, table, shift, options) per workbook
 
     # faculties
     for f in faculties_input:
         fname = f["Name"]
-        tbl = ftables.get(fname, empty_table_for_shift(f["Shift"]))
         fshift = f["Shift"]
+        tbl = ftables.get(fname)
+        if tbl is None:
+            tbl = _EMPTY_TABLES[fshift]
         bottom_rows = build_faculty_summary_rows(f)
         bottom_header = ["FacShort","Faculty Full Name","Semester","Subject","Theory Classes","Labs","Total Sessions"]
-        filename = f"Faculty_{fname}.xlsx"
-        save_excel_with_merges_and_summary(
-            filename, tbl, fshift,
+        filename = os.path.join(out_dir, f"Faculty_{fname}.xlsx")
+        exports.append((filename, tbl, fshift, dict(
             bottom_summary_rows=bottom_rows,
             bottom_summary_header=bottom_header,
             subject_color_map=subject_color_map,
@@ -932,17 +1222,17 @@ def export_all(ftables, dtables, faculties_input, university="", department="",
             university=university,
             department=department,
             academic=academic
-        )
+        )))
 
 
     # divisions
+    course_index = build_course_index()
     for (sem, div), payload in dtables.items():
         dshift = payload["shift"]; tbl = payload["table"]
-        bottom_rows = build_division_summary_rows(sem, div, tbl, dtables)
+        bottom_rows = build_division_summary_rows(sem, div, tbl, dtables, course_index)
         bottom_header = ["Subject (Lab indicated)","Faculty Full Name","Course Code"]
-        filename = f"Sem{sem}_Div{div}.xlsx"
-        save_excel_with_merges_and_summary(
-            filename, tbl, dshift,
+        filename = os.path.join(out_dir, f"Sem{sem}_Div{div}.xlsx")
+        exports.append((filename, tbl, dshift, dict(
             bottom_summary_rows=bottom_rows,
             bottom_summary_header=bottom_header,
             subject_color_map=subject_color_map,
@@ -952,33 +1242,68 @@ def export_all(ftables, dtables, faculties_input, university="", department="",
             university=university,
             department=department,
             academic=academic
-        )
+        )))
+
+    # every workbook is independent and openpyxl rendering is CPU-bound,
+    # so fan the saves out to worker processes when there is more than one core
+    # (nothing to export gives 0 workers and the loop below does nothing)
+    workers = min(max_workers or available_cpus(), len(exports))
+    if workers <= 1:
+        for task in exports:
+            _save_workbook(task)
+    else:
+        # a few batches per worker: fewer round trips, still balanced when
+        # workbooks differ in size
+        chunksize = max(1, len(exports) // (workers * 4))
+        if "fork" in multiprocessing.get_all_start_methods():
+            global _EXPORT_TASKS
+            _EXPORT_TASKS = exports
+            try:
+                with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork")) as ex:
+                    list(ex.map(_save_export, range(len(exports)), chunksize=chunksize))
+            finally:
+                _EXPORT_TASKS = ()
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                list(ex.map(_save_workbook, exports, chunksize=chunksize))
+    log_buffer.flush()
 
 #-----main-----#
-def main():
-    random.seed(7)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate faculty and division timetables.")
+    parser.add_argument("-c", "--config", metavar="JSON",
+                        help="read headers and faculty data from a JSON file instead of prompting")
+    parser.add_argument("-o", "--out-dir", default=".", help="directory for the Excel files (default: .)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(7)
     logger.info("Beginning scheduling run at %s", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
 
-    # --- get universal header inputs ---
-    print("\n--- Enter Universal Header Information ---")
-    university = input("University : ").strip()
-    department = input("Department Name: ").strip()
-    academic   = input("Semester Label / Academic Year (e.g. TIME TABLE – ODD SEMESTER 2025-26): ").strip() or "TIME TABLE – ODD SEMESTER 2025-26"
+    if args.config:
+        headers, faculties = load_faculty_data_from_json(args.config)
+        university, department, academic = headers["university"], headers["department"], headers["academic"]
+    else:
+        # --- get universal header inputs ---
+        print("\n--- Enter Universal Header Information ---")
+        university = input("University : ").strip()
+        department = input("Department Name: ").strip()
+        academic   = input("Semester Label / Academic Year (e.g. TIME TABLE – ODD SEMESTER 2025-26): ").strip() or "TIME TABLE – ODD SEMESTER 2025-26"
 
-    faculties = get_faculty_data()
+        faculties = get_faculty_data()
     ftables = {}
     dtables = {}
 
     # Apply free-day markings BEFORE scheduling so those days are treated as non-free.
     apply_free_day_markings_from_inputs(dtables, faculties)
 
-    for f in faculties:
-        assign_subjects_for_faculty(f, ftables, dtables)
+    assign_subjects(faculties, ftables, dtables, rng=rng)
 
 
     # pass header values to export_all
+    os.makedirs(args.out_dir, exist_ok=True)
     export_all(ftables, dtables, faculties,
-               university=university, department=department, academic=academic)
+               university=university, department=department, academic=academic,
+               out_dir=args.out_dir)
 
     logger.info("Scheduling run complete. Check generated Excel files and %s for logs.", LOG_FILE)
 if  __name__ == "__main__":
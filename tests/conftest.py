@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "Time_table"))
+
+
+@pytest.fixture
+def modules(tmp_path, monkeypatch):
+    """(app, timetable_generator), run from tmp_path with empty per-run settings."""
+    # the generator opens logs.txt in the working directory on import
+    monkeypatch.chdir(tmp_path)
+    import app
+    tg = app._generator()
+    tg.FREE_DAY_SETTINGS.clear()
+    return app, tg
@@ -0,0 +1,145 @@
+import os
+import time
+
+import pytest
+
+PAYLOAD = {
+    "university": "U",
+    "department": "D",
+    "academic": "A",
+    "faculties": [
+        {"Name": "AB", "Full_Name": "A B", "Designation": "Professor", "Shift": "8-3", "Weekly_Hours": 18,
+         "Subjects": [
+             {"Type": "Theory", "Semester": "5", "Division": "B", "Div_Shift": "8-3", "Subject": "OS",
+              "Course_Code": "C1", "Theory_Classes": 3, "Holidays": [], "Num_Holidays": 0},
+         ]},
+    ],
+}
+
+
+@pytest.fixture
+def app(modules, tmp_path, monkeypatch):
+    app, _ = modules
+    monkeypatch.setitem(app.app.config, "RESULT_FOLDER", str(tmp_path / "results"))
+    app.jobs.clear()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.app.test_client()
+
+
+def test_success_without_key_redirects_to_builder(client):
+    res = client.get("/success")
+    assert res.status_code == 302
+    assert res.headers["Location"].endswith("/builder")
+
+
+def test_success_lists_only_files(app, client):
+    folder = os.path.join(app.app.config["RESULT_FOLDER"], "job")
+    os.makedirs(os.path.join(folder, "subdir"))
+    open(os.path.join(folder, "Faculty_AB.xlsx"), "w").close()
+    open(os.path.join(folder, ".hidden"), "w").close()
+
+    assert app._list_results(folder) == ["Faculty_AB.xlsx"]
+    assert "/download/job/Faculty_AB.xlsx" in client.get("/success?key=job").get_data(as_text=True)
+
+
+def test_new_job_drops_oldest_results(app, client, monkeypatch):
+    monkeypatch.setitem(app.app.config, "MAX_RESULTS", 1)
+    results = app.app.config["RESULT_FOLDER"]
+    for age, name in enumerate(("older", "old")):
+        os.makedirs(os.path.join(results, name))
+        os.utime(os.path.join(results, name), (age, age))
+
+    res = client.post("/generate", json=PAYLOAD)
+    assert res.status_code == 202
+
+    assert os.path.isdir(os.path.join(results, "old"))
+    assert not os.path.exists(os.path.join(results, "older"))
+    wait_for(client, res.get_json()["status_url"])
+
+
+def wait_for(client, status_url, timeout=60, seen=None):
+    """Polls /status until the job finishes; returns the final JSON."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        body = client.get(status_url).get_json()
+        if seen is not None:
+            seen.append(body.get("state"))
+        if body.get("state") in ("done", "error"):
+            return body
+        time.sleep(0.05)
+    raise AssertionError("job did not finish")
+
+
+def test_generate_runs_a_job_and_serves_repeats_from_cache(app, client):
+    res = client.post("/generate", json=PAYLOAD)
+    assert res.status_code == 202
+    body = res.get_json()
+    job_id = body["job_id"]
+    assert body["status_url"].endswith("/status/" + job_id)
+
+    states = []
+    final = wait_for(client, body["status_url"], seen=states)
+    assert final["state"] == "done", final
+    assert set(states) <= {"queued", "running", "done"}
+    assert final["redirect"].endswith("key=" + job_id)
+    assert sorted(os.listdir(os.path.join(app.app.config["RESULT_FOLDER"], job_id))) == [
+        "Faculty_AB.xlsx", "Sem5_DivB.xlsx"]
+
+    # a reported job leaves the registry; /status still answers from its results
+    assert job_id not in app.jobs
+    assert client.get(body["status_url"]).get_json()["state"] == "done"
+
+    again = client.post("/generate", json=PAYLOAD)
+    assert again.status_code == 200
+    assert again.get_json()["cached"] is True
+
+
+def test_failed_job_reports_error_and_can_be_retried(app, client):
+    broken = {**PAYLOAD, "faculties": [{k: v for k, v in PAYLOAD["faculties"][0].items() if k != "Name"}]}
+
+    body = client.post("/generate", json=broken).get_json()
+    final = wait_for(client, body["status_url"])
+    assert final["state"] == "error"
+    assert final["ok"] is False
+    assert body["job_id"] not in app.jobs
+
+    # nothing was cached, so posting it again queues a new job
+    assert client.post("/generate", json=broken).status_code == 202
+
+
+def test_unknown_job_is_404(client):
+    res = client.get("/status/0123456789abcdef")
+    assert res.status_code == 404
+    assert res.get_json()["ok"] is False
+
+
+def test_overbooked_input_is_rejected_with_422(client):
+    subject = {**PAYLOAD["faculties"][0]["Subjects"][0], "Theory_Classes": 100}
+    overbooked = {**PAYLOAD, "faculties": [{**PAYLOAD["faculties"][0], "Subjects": [subject]}]}
+
+    res = client.post("/generate", json=overbooked)
+    assert res.status_code == 422
+    assert "Over-constrained" in res.get_json()["error"]
+
+
+def test_empty_faculty_list_is_400(client):
+    res = client.post("/generate", json={**PAYLOAD, "faculties": []})
+    assert res.status_code == 400
+    assert res.get_json()["ok"] is False
+
+
+def test_malformed_body_is_400_json(client):
+    res = client.post("/generate", data="{not json", content_type="application/json")
+    assert res.status_code == 400
+    assert res.get_json()["ok"] is False
+
+
+def test_oversized_body_is_413_json(app, client, monkeypatch):
+    monkeypatch.setitem(app.app.config, "MAX_CONTENT_LENGTH", 64)
+    res = client.post("/generate", json=PAYLOAD)
+    assert res.status_code == 413
+    assert res.get_json()["ok"] is False
@@ -0,0 +1,13 @@
+import json
+
+
+def test_config_run_without_faculties_writes_nothing(modules, tmp_path):
+    _, tg = modules
+    config = tmp_path / "input.json"
+    config.write_text(json.dumps({"university": "U", "department": "D", "academic": "A", "faculties": []}),
+                      encoding="utf-8")
+    out = tmp_path / "out"
+
+    tg.main(["-c", str(config), "-o", str(out)])
+
+    assert list(out.iterdir()) == []
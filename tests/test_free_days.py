@@ -0,0 +1,39 @@
+import json
+
+# The web builder sends "Holidays" on every subject, [] when there are none.
+PAYLOAD = {
+    "university": "U",
+    "department": "D",
+    "academic": "A",
+    "faculties": [
+        {"Name": "AB", "Full_Name": "A B", "Designation": "Professor", "Shift": "8-3", "Weekly_Hours": 18,
+         "Subjects": [
+             {"Type": "Theory", "Semester": "5", "Division": "B", "Div_Shift": "8-3", "Subject": "OS",
+              "Course_Code": "C1", "Theory_Classes": 3, "Holidays": ["Sat"], "Num_Holidays": 1},
+             {"Type": "Theory", "Semester": "3", "Division": "A", "Div_Shift": "10-5", "Subject": "Maths",
+              "Course_Code": "C2", "Theory_Classes": 2, "Holidays": [], "Num_Holidays": 0},
+         ]},
+        {"Name": "CD", "Full_Name": "C D", "Designation": "Professor", "Shift": "10-5", "Weekly_Hours": 18,
+         "Subjects": [
+             {"Type": "Lab", "Semester": "5", "Division": "B", "Div_Shift": "8-3", "Subject": "DBMS",
+              "Course_Code": "C3", "Num_Labs": 1, "Batches": ["B1", "B2"], "Batches_Grouped": False,
+              "Holidays": [], "Num_Holidays": 0},
+         ]},
+    ],
+}
+
+
+def test_cli_and_web_record_the_same_free_days(modules, tmp_path):
+    app, tg = modules
+    config = tmp_path / "input.json"
+    config.write_text(json.dumps(PAYLOAD), encoding="utf-8")
+
+    tg.main(["-c", str(config), "-o", str(tmp_path / "cli")])
+    cli = dict(tg.FREE_DAY_SETTINGS)
+
+    app._run_generation(json.loads(json.dumps(PAYLOAD)), str(tmp_path / "web"), 1)
+    web = dict(tg.FREE_DAY_SETTINGS)
+
+    assert cli[("5", "B")] == ["Sat"]
+    # the CLI also records [] for divisions without free days; /generate leaves them out
+    assert {k: v for k, v in cli.items() if v} == web